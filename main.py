@@ -1,8 +1,10 @@
 from __future__ import division
 
 import audioop
+import logging
 import multiprocessing
 import threading
+import time
 from multiprocessing.managers import DictProxy
 from multiprocessing.synchronize import Event as MultiprocessingEvent
 
@@ -28,10 +30,16 @@ from flet import (
 )
 from flet.dropdown import Option as DropdownOption
 
+from whispers_translate.scheduler import ModelScheduler
 from whispers_translate.sound_input import AudioInput
 from whispers_translate.whisper_translate import WhisperTranslator
 
 IS_DEV_UI = False
+# models to switch between, from the fastest to the most accurate
+MODELS = ('tiny', 'base', 'small')
+INITIAL_MODEL = 'base'
+# maximum seconds between the end of a phrase and its translation
+TARGET_LATENCY = 3.0
 
 
 def recognize_worker(
@@ -41,25 +49,33 @@ def recognize_worker(
     recognize_thread_event: MultiprocessingEvent,
     shared_language: DictProxy
 ):
-    whisper_translator = WhisperTranslator(lazy=False)
+    logging.basicConfig(level=logging.INFO)
+
+    scheduler = ModelScheduler(
+        [WhisperTranslator(model, lazy=False) for model in MODELS],
+        target_latency=TARGET_LATENCY,
+        initial=MODELS.index(INITIAL_MODEL),
+    )
     recognize_thread_model_loaded.set()
 
     while True:
-        audio = audio_queue.get()  # retrieve the next audio processing job from the main thread
+        job = audio_queue.get()  # retrieve the next audio processing job from the main thread
 
-        if audio is None:
+        if job is None:
             audio_queue.task_done()
             results_queue.put(None)
             continue
 
+        queued_at, audio = job
+
         if recognize_thread_event.is_set():
             audio_queue.task_done()
             continue
 
         LANGUAGE: str = shared_language['language']
 
-        translation = whisper_translator.translate(
-            audio, language=LANGUAGE, translate=True)
+        translation = scheduler.translate(
+            audio, language=LANGUAGE, translate=True, queue_latency=time.monotonic() - queued_at)
 
         results_queue.put(translation)
 
@@ -75,7 +91,7 @@ def listener_worker(device_index: int, audio_queue: multiprocessing.JoinableQueu
     with AudioInput(device_index) as device:
         while True:  # repeatedly listen for phrases and put the resulting audio on the audio processing job queue
             r = recognizer.listen(device, phrase_time_limit=phrase_time_limit)
-            audio_queue.put(r)
+            audio_queue.put((time.monotonic(), r))
             if listener_thread_event.is_set():
                 break
 
@@ -210,6 +226,15 @@ def main(page: Page):
 
     def reload_devices(e):
         nonlocal devices
+        # close the listener stream, PortAudio can only look for new devices once every stream is closed
+        stop_listening(None)
+
+        if AudioInput.refresh_devices():
+            device_text.current.value = ''
+        else:
+            device_text.current.value = 'Devices not reloaded, a device is still in use'
+        device_text.current.update()
+
         devices = AudioInput.list_microphone_names()
         current_value = devices_dropdown.current.value
         devices_dropdown.current.options = [
@@ -217,8 +242,6 @@ def main(page: Page):
         devices_dropdown.current.value = current_value
         devices_dropdown.current.update()
 
-        stop_listening(None)
-
     page.add(Row([
         Dropdown(
             options=[DropdownOption(device.name) for device in devices],
@@ -0,0 +1,127 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("whisper")
+
+from whispers_translate import scheduler  # noqa: E402
+from whispers_translate.config import SAMPLE_RATE  # noqa: E402
+from whispers_translate.scheduler import ModelScheduler  # noqa: E402
+
+PHRASE_SECONDS = 2.0
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class StubTranslator:
+    """ Advances the clock by ``rtf`` times the duration of the audio it translates. """
+
+    def __init__(self, model_name: str, rtf: float, clock: Clock):
+        self.model_name = model_name
+        self.rtf = rtf
+        self.clock = clock
+
+    def translate(self, audio_data, **kwargs):
+        duration = len(audio_data.get_raw_data()) / (2 * SAMPLE_RATE)
+        self.clock.now += self.rtf * duration
+        return self.model_name
+
+
+class StubAudio:
+    def __init__(self, seconds: float):
+        self.raw_data = b'\0' * int(seconds * SAMPLE_RATE) * 2
+
+    def get_raw_data(self) -> bytes:
+        return self.raw_data
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(scheduler, 'time', SimpleNamespace(
+        monotonic=clock.monotonic))
+    return clock
+
+
+def make_scheduler(clock: Clock, rtfs, **kwargs) -> ModelScheduler:
+    translators = [StubTranslator(name, rtf, clock)
+                   for name, rtf in zip(('tiny', 'base', 'small'), rtfs)]
+    return ModelScheduler(translators, **kwargs)
+
+
+def translate(model_scheduler: ModelScheduler, queue_latency: float = 0.0, seconds: float = PHRASE_SECONDS) -> str:
+    return model_scheduler.translate(StubAudio(seconds), queue_latency=queue_latency)
+
+
+def test_downgrade_when_latency_over_target(clock, caplog):
+    model_scheduler = make_scheduler(
+        clock, (0.1, 1.0), target_latency=3.0, initial=1, cooldown=1)
+
+    with caplog.at_level(logging.INFO, logger=scheduler.__name__):
+        assert translate(model_scheduler, queue_latency=2.0) == 'base'
+
+    assert model_scheduler.current.model_name == 'tiny'
+    assert 'base -> tiny' in caplog.text
+
+
+def test_no_switch_during_cooldown(clock):
+    model_scheduler = make_scheduler(
+        clock, (0.1, 1.0), target_latency=3.0, initial=1, cooldown=3)
+
+    for _ in range(2):
+        translate(model_scheduler, queue_latency=2.0)
+        assert model_scheduler.current.model_name == 'base'
+
+    translate(model_scheduler, queue_latency=2.0)
+    assert model_scheduler.current.model_name == 'tiny'
+
+    # a new cooldown starts after the switch
+    for _ in range(2):
+        translate(model_scheduler, queue_latency=0.0)
+        assert model_scheduler.current.model_name == 'tiny'
+
+
+@pytest.mark.parametrize('queue_latency,upgrades', [(1.3, False), (1.1, True)])
+def test_upgrade_only_under_low_water(clock, queue_latency, upgrades):
+    # unmeasured base is assumed 3 times slower than tiny: 0.1 * 3 * 2s = 0.6s plus the queue
+    model_scheduler = make_scheduler(
+        clock, (0.1, 0.5), target_latency=3.0, low_water=0.6, cooldown=1)
+
+    translate(model_scheduler, queue_latency=queue_latency)
+
+    expected = 'base' if upgrades else 'tiny'
+    assert model_scheduler.current.model_name == expected
+
+
+def test_returns_to_bigger_model_when_load_drops(clock):
+    model_scheduler = make_scheduler(
+        clock, (0.1, 0.5), target_latency=3.0, initial=1, cooldown=1, smoothing=1.0)
+    tiny, base = model_scheduler.translators
+
+    tiny.rtf, base.rtf = 0.4, 2.0
+    translate(model_scheduler)
+    assert model_scheduler.current is tiny
+    translate(model_scheduler)
+    assert model_scheduler.current is tiny
+
+    # base was measured under load, its real-time factor follows tiny's back down
+    tiny.rtf, base.rtf = 0.1, 0.5
+    translate(model_scheduler)
+    assert model_scheduler.current is base
+
+
+def test_empty_audio_does_not_switch(clock):
+    model_scheduler = make_scheduler(
+        clock, (0.1, 1.0), target_latency=3.0, initial=1, cooldown=1)
+
+    for _ in range(3):
+        translate(model_scheduler, queue_latency=5.0, seconds=0)
+
+    assert model_scheduler.current.model_name == 'base'
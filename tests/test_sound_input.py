@@ -0,0 +1,26 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+audioop = pytest.importorskip("audioop")
+sound_input = pytest.importorskip("whispers_translate.sound_input")
+
+
+def audioop_debiased_energy(buffer: bytes) -> int:
+    energy = -audioop.rms(buffer, 2)
+    energy_bytes = bytes([energy & 0xFF, (energy >> 8) & 0xFF])
+    return audioop.rms(audioop.add(buffer, energy_bytes * (len(buffer) // 2), 2), 2)
+
+
+def test_debiased_energy_matches_audioop():
+    rng = np.random.default_rng(0)
+    buffers = []
+    for i in range(3000):
+        scale = rng.uniform(0, 300) if i % 10 else rng.uniform(0, 20000)
+        bias = rng.uniform(-200, 200) if i % 2 else 0
+        samples = rng.standard_normal(1024) * scale + bias
+        buffers.append(np.clip(samples, -32768, 32767).astype(np.int16).tobytes())
+
+    result = sound_input._debiased_energy(b''.join(buffers), len(buffers))
+
+    assert result.tolist() == [audioop_debiased_energy(buffer)
+                               for buffer in buffers]
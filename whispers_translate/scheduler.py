@@ -0,0 +1,107 @@
+import logging
+import time
+from typing import List, Optional, Sequence
+
+from .config import SAMPLE_RATE
+from .types import AudioDataP
+from .whisper_translate import WhisperTranslator
+
+logger = logging.getLogger(__name__)
+
+# assumed slowdown of a bigger model whose real-time factor wasn't measured yet
+_UNKNOWN_RTF_FACTOR = 3.0
+
+
+class ModelScheduler:
+    """ Picks, for every phrase, one of several ``WhisperTranslator`` to keep the end-to-end latency under ``target_latency`` seconds.
+
+        ``translators`` must be sorted from the fastest to the most accurate one, e.g. "tiny", "base", "small", and they should be created with ``lazy=False`` so a switch doesn't stall on loading a model.
+
+        The latency of a phrase is the time it waited in the queue (``queue_latency``) plus the time whisper took to process it. The scheduler moves to a faster translator when the smoothed latency goes over the target, and to a slower one only when its estimated latency, from the measured real-time factor, stays under ``low_water * target_latency``. After a switch it waits ``cooldown`` phrases before switching again, so it doesn't flap.
+    """
+
+    __slots__ = ('translators', 'target_latency', 'low_water', 'cooldown', 'smoothing',
+                 '_level', '_rtf', '_latency', '_queue_latency', '_duration', '_calls_since_switch')
+
+    def __init__(self, translators: Sequence[WhisperTranslator], target_latency: float = 3.0, initial: int = 0,
+                 low_water: float = 0.6, cooldown: int = 3, smoothing: float = 0.3):
+        assert len(translators) > 0, "At least one translator is needed"
+        assert 0 <= initial < len(
+            translators), "Initial level must be an index of translators"
+        assert target_latency > 0, "Target latency must be positive"
+        assert 0 < low_water < 1, "Low water must be between 0 and 1"
+        assert 0 < smoothing <= 1, "Smoothing must be between 0 and 1"
+
+        self.translators = list(translators)
+        self.target_latency = target_latency
+        self.low_water = low_water
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+
+        self._level = initial
+        self._rtf: List[Optional[float]] = [None] * len(self.translators)
+        self._latency: Optional[float] = None
+        self._queue_latency: Optional[float] = None
+        self._duration: Optional[float] = None
+        self._calls_since_switch = 0
+
+    @property
+    def current(self) -> WhisperTranslator:
+        return self.translators[self._level]
+
+    def translate(self, audio_data: AudioDataP, *args, queue_latency: float = 0.0, **kwargs):
+        """ Same as ``WhisperTranslator.translate`` using the current translator, ``queue_latency`` is the time in seconds ``audio_data`` waited to be processed. """
+        start = time.monotonic()
+        result = self.current.translate(audio_data, *args, **kwargs)
+        elapsed = time.monotonic() - start
+
+        # translate reads the raw data as 16 bit samples at whisper's sample rate
+        duration = len(audio_data.get_raw_data()) / (2 * SAMPLE_RATE)
+        self._update(elapsed, duration, queue_latency)
+
+        return result
+
+    def _smooth(self, average: Optional[float], value: float) -> float:
+        if average is None:
+            return value
+        return average + self.smoothing * (value - average)
+
+    def _estimate_latency(self, level: int) -> float:
+        rtf = self._rtf[level]
+        if rtf is None:
+            rtf = self._rtf[self._level] * _UNKNOWN_RTF_FACTOR
+        return self._queue_latency + rtf * self._duration
+
+    def _update(self, elapsed: float, duration: float, queue_latency: float):
+        if duration > 0:
+            previous = self._rtf[self._level]
+            rtf = self._smooth(previous, elapsed / duration)
+            if previous:
+                # the load of the box changed, the models not running are assumed to follow it
+                self._rtf = [value * rtf / previous if value is not None else None
+                             for value in self._rtf]
+            self._rtf[self._level] = rtf
+            self._duration = self._smooth(self._duration, duration)
+        self._latency = self._smooth(self._latency, queue_latency + elapsed)
+        self._queue_latency = self._smooth(self._queue_latency, queue_latency)
+        self._calls_since_switch += 1
+
+        if self._calls_since_switch < self.cooldown or self._rtf[self._level] is None:
+            return
+
+        if self._latency > self.target_latency and self._level > 0:
+            self._switch(self._level - 1)
+        elif self._level + 1 < len(self.translators):
+            estimate = self._estimate_latency(self._level + 1)
+            if estimate < self.low_water * self.target_latency:
+                self._switch(self._level + 1)
+
+    def _switch(self, level: int):
+        logger.info("switching whisper model %s -> %s: latency %.2fs (queue %.2fs), real-time factor %.2f, target %.2fs",
+                    self.current.model_name, self.translators[level].model_name,
+                    self._latency, self._queue_latency, self._rtf[self._level], self.target_latency)
+
+        self._level = level
+        self._calls_since_switch = 0
+        # the measured latency belongs to the previous model
+        self._latency = None
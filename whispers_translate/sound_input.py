@@ -6,9 +6,12 @@ except ImportError:
     _IS_WINDOWS = False
 
 import audioop
+import threading
+import time
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import speech_recognition as sr
 from pydub import AudioSegment
 
@@ -21,6 +24,71 @@ class DeviceInfo:
     index: int
 
 
+class _PortAudioHost:
+    """
+    A single ``pyaudio.PyAudio`` instance shared by every ``AudioInput``, with a registry of the device infos.
+
+    Initializing PortAudio enumerates every device, which takes seconds on machines with many loopback endpoints, so it's done once and the registry is cached. PortAudio only sees new devices after being initialized again, that happens in ``refresh`` once every stream is closed.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._streams_closed = threading.Condition(self._lock)
+        self._audio: Optional[pyaudio.PyAudio] = None
+        self._devices: Optional[List[dict]] = None
+        self._open_streams = 0
+
+    @property
+    def audio(self) -> pyaudio.PyAudio:
+        with self._lock:
+            if self._audio is None:
+                self._audio = pyaudio.PyAudio()
+                self._devices = None
+            return self._audio
+
+    @property
+    def devices(self) -> List[dict]:
+        with self._lock:
+            audio = self.audio
+            if self._devices is None:
+                self._devices = [audio.get_device_info_by_index(
+                    i) for i in range(audio.get_device_count())]
+            return self._devices
+
+    def refresh(self, timeout: float = 2.0) -> bool:
+        """ Initializes PortAudio again to enumerate the devices. It waits up to ``timeout`` seconds for the open streams to close, and returns ``False`` if they didn't and the cached devices were kept. """
+        with self._streams_closed:
+            if not self._streams_closed.wait_for(lambda: self._open_streams == 0, timeout):
+                return False
+
+            if self._audio is not None:
+                self._audio.terminate()
+                self._audio = None
+            self._devices = None
+
+            return True
+
+    def open(self, **kwargs):
+        with self._lock:
+            stream = self.audio.open(**kwargs)
+            self._open_streams += 1
+            return stream
+
+    def close(self, pyaudio_stream):
+        with self._lock:
+            try:
+                # sometimes, if the stream isn't stopped, closing the stream throws an exception
+                if not pyaudio_stream.is_stopped():
+                    pyaudio_stream.stop_stream()
+            finally:
+                self._open_streams -= 1
+                pyaudio_stream.close()
+                self._streams_closed.notify_all()
+
+
+_host = _PortAudioHost()
+
+
 class AudioInput(sr.AudioSource):
     """
     Creates a new ``AudioInput`` instance, which represents a physical microphone on the computer or loopback dev. Subclass of ``AudioSource``.
@@ -47,27 +115,21 @@ class AudioInput(sr.AudioSource):
         assert isinstance(
             chunk_size, int) and chunk_size > 0, "Chunk size must be a positive integer"
 
-        audio = pyaudio.PyAudio()
-        channels = 1
-        try:
-            count = audio.get_device_count()  # obtain device count
-            if device_index is not None:  # ensure device index is in range
-                assert 0 <= device_index < count, "Device index out of range ({} devices available; device index should be between 0 and {} inclusive)".format(
-                    count, count - 1)
-
-            device_info = audio.get_device_info_by_index(
-                device_index) if device_index is not None else audio.get_default_input_device_info()
-
-            if sample_rate is None:  # automatically set the sample rate to the hardware's default sample rate if not specified
-                assert isinstance(device_info.get("defaultSampleRate"), (float, int)
-                                  ) and device_info["defaultSampleRate"] > 0, "Invalid device info returned from PyAudio: {}".format(device_info)
-                sample_rate = int(device_info["defaultSampleRate"])
-
-            channels = device_info["maxInputChannels"]
-        except Exception as e:
-            raise e
-        finally:
-            audio.terminate()
+        devices = _host.devices
+        count = len(devices)  # obtain device count
+        if device_index is not None:  # ensure device index is in range
+            assert 0 <= device_index < count, "Device index out of range ({} devices available; device index should be between 0 and {} inclusive)".format(
+                count, count - 1)
+
+        device_info = devices[
+            device_index] if device_index is not None else _host.audio.get_default_input_device_info()
+
+        if sample_rate is None:  # automatically set the sample rate to the hardware's default sample rate if not specified
+            assert isinstance(device_info.get("defaultSampleRate"), (float, int)
+                              ) and device_info["defaultSampleRate"] > 0, "Invalid device info returned from PyAudio: {}".format(device_info)
+            sample_rate = int(device_info["defaultSampleRate"])
+
+        channels = device_info["maxInputChannels"]
 
         self.device_index = device_index
         self.format = pyaudio.paInt16  # 16-bit int sampling
@@ -86,81 +148,62 @@ class AudioInput(sr.AudioSource):
         Returns a list of the names of all available microphones. For microphones where the name can't be retrieved, the list entry contains ``None`` instead.
 
         The index of each microphone's name in the returned list is the same as its device index when creating a ``Microphone`` instance - if you want to use the microphone at index 3 in the returned list, use ``Microphone(device_index=3)``.
-        """
-        audio = pyaudio.PyAudio()
-        try:
-            result: List[DeviceInfo] = []
-            for i in range(audio.get_device_count()):
-                device_info = audio.get_device_info_by_index(i)
 
-                if device_info['maxInputChannels'] == 0:
-                    continue
-                result.append(DeviceInfo(
-                    name=device_info['name'], index=device_info['index']))
+        Devices are read from a cache, call ``refresh_devices`` to look for plugged or removed devices.
+        """
+        return [DeviceInfo(name=device_info['name'], index=device_info['index'])
+                for device_info in _host.devices if device_info['maxInputChannels'] > 0]
 
-        finally:
-            audio.terminate()
-        return result
+    @staticmethod
+    def refresh_devices(timeout: float = 2.0) -> bool:
+        """
+        Looks for plugged or removed devices. PortAudio can only do it once every ``AudioInput`` is closed, so it waits up to ``timeout`` seconds for them and returns ``False`` if the cached devices were kept.
+        """
+        return _host.refresh(timeout)
 
     @staticmethod
-    def list_working_microphones():
+    def list_working_microphones(timeout: float = 1.0) -> Dict[int, str]:
         """
         Returns a dictionary mapping device indices to microphone names, for microphones that are currently hearing sounds. When using this function, ensure that your microphone is unmuted and make some noise at it to ensure it will be detected as working.
 
         Each key in the returned dictionary can be passed to the ``Microphone`` constructor to use that microphone. For example, if the return value is ``{3: "HDA Intel PCH: ALC3232 Analog (hw:1,0)"}``, you can do ``Microphone(device_index=3)`` to use that microphone.
+
+        Every device records at the same time, devices that can't be opened alongside the others are probed again one by one. Devices that don't deliver 1024 frames within ``timeout`` seconds are skipped.
         """
-        audio = pyaudio.PyAudio()
-        try:
-            result = {}
-            for device_index in range(audio.get_device_count()):
-                device_info = audio.get_device_info_by_index(device_index)
-                device_name = device_info.get("name")
-                assert isinstance(device_info.get("defaultSampleRate"), (float, int)
-                                  ) and device_info["defaultSampleRate"] > 0, "Invalid device info returned from PyAudio: {}".format(device_info)
-                try:
-                    # read audio
-                    pyaudio_stream = audio.open(
-                        input_device_index=device_index, channels=1, format=pyaudio.paInt16,
-                        rate=int(device_info["defaultSampleRate"]), input=True
-                    )
-                    try:
-                        buffer = pyaudio_stream.read(1024)
-                        if not pyaudio_stream.is_stopped():
-                            pyaudio_stream.stop_stream()
-                    finally:
-                        pyaudio_stream.close()
-                except Exception:
-                    continue
+        device_infos = [
+            device_info for device_info in _host.devices if device_info['maxInputChannels'] > 0]
+        buffers, failed = _record_together(device_infos, timeout)
 
-                # compute RMS of debiased audio
-                energy = -audioop.rms(buffer, 2)
-                energy_bytes = chr(energy & 0xFF) + chr((energy >> 8) & 0xFF) if bytes is str else bytes(
-                    [energy & 0xFF, (energy >> 8) & 0xFF])  # Python 2 compatibility
-                debiased_energy = audioop.rms(audioop.add(
-                    buffer, energy_bytes * (len(buffer) // 2), 2), 2)
+        # devices of the same card (hw, plughw, default, pulse...) are often busy while another one is open
+        for device_info in failed:
+            retried, _ = _record_together([device_info], timeout)
+            buffers.update(retried)
 
-                if debiased_energy > 30:  # probably actually audio
-                    result[device_index] = device_name
-        finally:
-            audio.terminate()
-        return result
+        indexes = [device_index for device_index,
+                   buffer in buffers.items() if len(buffer) == 2048]
+        if not indexes:
+            return {}
+
+        debiased_energy = _debiased_energy(
+            b''.join(buffers[device_index] for device_index in indexes), len(indexes))
+
+        names = {device_info['index']: device_info.get("name")
+                 for device_info in _host.devices}
+        # probably actually audio
+        return {device_index: names[device_index] for device_index, value in zip(indexes, debiased_energy) if value > 30}
 
     def __enter__(self):
         assert self.stream is None, "This audio source is already inside a context manager"
-        self.audio = pyaudio.PyAudio()
-        try:
-            self.stream = AudioInput.AudioInputStream(
-                self.audio.open(
-                    input_device_index=self.device_index, channels=self.CHANNELS, format=self.format,
-                    rate=self.SAMPLE_RATE, frames_per_buffer=self.CHUNK, input=True,
-                ),
-                sample_width=self.SAMPLE_WIDTH,
-                sample_rate=self.SAMPLE_RATE,
-                channels=self.CHANNELS,
-            )
-        except Exception as e:
-            self.audio.terminate()
-            raise e
+        self.audio = _host.audio
+        self.stream = AudioInput.AudioInputStream(
+            _host.open(
+                input_device_index=self.device_index, channels=self.CHANNELS, format=self.format,
+                rate=self.SAMPLE_RATE, frames_per_buffer=self.CHUNK, input=True,
+            ),
+            sample_width=self.SAMPLE_WIDTH,
+            sample_rate=self.SAMPLE_RATE,
+            channels=self.CHANNELS,
+        )
 
         return self
 
@@ -169,7 +212,7 @@ class AudioInput(sr.AudioSource):
             self.stream.close()
         finally:
             self.stream = None
-            self.audio.terminate()
+            self.audio = None
 
     class AudioInputStream(object):
         def __init__(self, pyaudio_stream, sample_width: int, sample_rate: int, channels: int = 1):
@@ -195,29 +238,71 @@ class AudioInput(sr.AudioSource):
             return buffer
 
         def close(self):
+            _host.close(self.pyaudio_stream)
+
+
+def _debiased_energy(data: bytes, count: int) -> np.ndarray:
+    """ Returns the RMS of the debiased audio of ``count`` buffers of 16 bit samples joined in ``data``, the same as ``audioop.rms(audioop.add(buffer, -audioop.rms(buffer)))`` for each one. """
+    samples = np.frombuffer(data, np.int16).reshape(
+        count, -1).astype(np.float64)
+
+    energy = np.sqrt(np.mean(samples ** 2, axis=1, keepdims=True))
+    debiased = np.clip(samples - np.floor(energy), -32768, 32767)
+    return np.floor(np.sqrt(np.mean(debiased ** 2, axis=1)))
+
+
+def _record_together(device_infos: List[dict], timeout: float) -> Tuple[Dict[int, bytes], List[dict]]:
+    """ Records 1024 frames from every device at the same time. Returns the buffers by device index and the infos of the devices that couldn't be opened. """
+    streams = {}
+    failed: List[dict] = []
+    buffers: Dict[int, bytes] = {}
+    try:
+        for device_info in device_infos:
+            assert isinstance(device_info.get("defaultSampleRate"), (float, int)
+                              ) and device_info["defaultSampleRate"] > 0, "Invalid device info returned from PyAudio: {}".format(device_info)
             try:
-                # sometimes, if the stream isn't stopped, closing the stream throws an exception
-                if not self.pyaudio_stream.is_stopped():
-                    self.pyaudio_stream.stop_stream()
-            finally:
-                self.pyaudio_stream.close()
+                streams[device_info['index']] = _host.open(
+                    input_device_index=device_info['index'], channels=1, format=pyaudio.paInt16,
+                    rate=int(device_info["defaultSampleRate"]), input=True
+                )
+            except Exception:
+                failed.append(device_info)
+
+        # poll instead of a blocking read so a stalled device can't hang the probe
+        deadline = time.monotonic() + timeout
+        while True:
+            for device_index, pyaudio_stream in streams.items():
+                if device_index in buffers:
+                    continue
+                try:
+                    if pyaudio_stream.get_read_available() >= 1024:
+                        buffers[device_index] = pyaudio_stream.read(
+                            1024, exception_on_overflow=False)
+                except Exception:
+                    buffers[device_index] = b''
+
+            if len(buffers) == len(streams) or time.monotonic() >= deadline:
+                break
+            time.sleep(0.01)
+    finally:
+        for pyaudio_stream in streams.values():
+            _host.close(pyaudio_stream)
+
+    return buffers, failed
 
 
 def get_default_loopback_speakers_index() -> int:
-    p = pyaudio.PyAudio()
-    wasapi_info = p.get_host_api_info_by_type(pyaudio.paWASAPI)
+    devices = _host.devices
+    wasapi_info = _host.audio.get_host_api_info_by_type(pyaudio.paWASAPI)
 
-    default_speakers = p.get_device_info_by_index(
-        wasapi_info["defaultOutputDevice"])
+    default_speakers = devices[wasapi_info["defaultOutputDevice"]]
 
     if not default_speakers["isLoopbackDevice"]:
-        for loopback in p.get_loopback_device_info_generator():
-            if default_speakers["name"] in loopback["name"]:
+        for loopback in devices:
+            if loopback.get("isLoopbackDevice") and default_speakers["name"] in loopback["name"]:
                 default_speakers = loopback
                 break
 
-    p.terminate()
-
     return default_speakers['index'], default_speakers
 
 
@@ -19,6 +19,10 @@ class WhisperTranslator:
         if not lazy:
             self._load_model()
 
+    @property
+    def model_name(self) -> str:
+        return self._model_name
+
     def _load_model(self):
         device = None
 